@@ -1,9 +1,47 @@
 import math
+import numpy as np
+from jit import HAVE_NUMBA, njit, prange, run_kernel
 # Deal Grove model breaks down for oxides thinner than 25 nm. In the case of my lab, our oxide was much larger.
 
 # B is the parabolic rate constant
+@njit('float64(float64,float64,float64)', cache=True)
 def deal_grove_thickness(B_nm2_per_min, B_over_A_nm_per_min, t_min):
     # Solve x^2 + (B/A) x - B t = 0  → x = [-A + sqrt(A^2 + 4 B t)]/2
     A_nm = B_nm2_per_min / max(B_over_A_nm_per_min, 1e-12)
     disc = A_nm*A_nm + 4*B_nm2_per_min*t_min
-    return (-A_nm + math.sqrt(disc)) / 2.0  # nm
\ No newline at end of file
+    if disc < 0:
+        # Explicit so the JIT and plain-Python builds fail the same way
+        raise ValueError("math domain error")
+    return (-A_nm + math.sqrt(disc)) / 2.0  # nm
+
+def deal_grove_factory(B_nm2_per_min, B_over_A_nm_per_min):
+    # x(t) for fixed (B, B/A); A, A^2 and 4B are computed once. Works on
+    # scalars or arrays of t_min.
+    A_nm = B_nm2_per_min / max(B_over_A_nm_per_min, 1e-12)
+    A2 = A_nm*A_nm
+    four_B = 4*B_nm2_per_min
+
+    def thickness(t_min):
+        disc = A2 + four_B*np.asarray(t_min, dtype=np.float64)
+        if np.any(disc < 0):
+            raise ValueError("math domain error")  # same as deal_grove_thickness
+        return 0.5*(-A_nm + np.sqrt(disc))
+    return thickness
+
+@njit(cache=True, parallel=True)
+def _deal_grove_vec_kernel(B_nm2_per_min, B_over_A_nm_per_min, t_min_arr):
+    # Check the domain serially first: an exception can't leave a prange body
+    A_nm = B_nm2_per_min / max(B_over_A_nm_per_min, 1e-12)
+    for i in range(t_min_arr.shape[0]):
+        if A_nm*A_nm + 4*B_nm2_per_min*t_min_arr[i] < 0:
+            raise ValueError("math domain error")
+    out = np.empty(t_min_arr.shape[0])
+    for i in prange(t_min_arr.shape[0]):
+        out[i] = deal_grove_thickness(B_nm2_per_min, B_over_A_nm_per_min, t_min_arr[i])
+    return out
+
+# Same model over an array of times, e.g. the x(t) curve for animate_oxidation
+def deal_grove_thickness_vec(B_nm2_per_min, B_over_A_nm_per_min, t_min_arr):
+    if HAVE_NUMBA:
+        return run_kernel(_deal_grove_vec_kernel, t_min_arr, B_nm2_per_min, B_over_A_nm_per_min)
+    return deal_grove_factory(B_nm2_per_min, B_over_A_nm_per_min)(t_min_arr)
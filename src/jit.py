@@ -0,0 +1,22 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    # Numba is optional. Decorated functions stay plain Python and callers use
+    # their NumPy paths instead.
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+def run_kernel(kernel, x, *args):
+    # Kernels are compiled for 1-D float64 only; coerce anything the NumPy
+    # paths accept (ints, float32, scalars, n-D arrays), call kernel(*args, x)
+    # and restore the input's shape.
+    x = np.asarray(x, dtype=np.float64)
+    return kernel(*args, x.ravel()).reshape(x.shape)  # ravel is contiguous
@@ -1,8 +1,8 @@
-import os, csv
+import os, csv, math
 import numpy as np
 from deal_grove import deal_grove_thickness
 from diffusion import *
-from visual import plot_dopant_profiles, draw_wafer_cross_section
+from visual import plot_dopant_profiles, draw_wafer_cross_section, wait_for_saves
 from datetime import datetime
 
 os.makedirs("figures", exist_ok=True)
@@ -27,24 +27,31 @@ ts = datetime.now().strftime("%Y%m%d-%H%M%S")
 suffix = f"field{field_nm}nm_gate{gate_nm}nm_inter{inter_nm}nm_{ts}"
 
 with open("data/oxide_table.csv","w",newline="", encoding="utf-8-sig") as f:
-    w=csv.writer(f); w.writerow(["Parameter","Value"])
-    w.writerow(["Field oxide (nm)", f"{field:.1f}"])
-    w.writerow(["Gate oxide (nm)", f"{gate:.1f}"])
-    w.writerow(["Intermediate oxide (nm)", f"{inter:.1f}"])
+    csv.writer(f).writerows([
+        ("Parameter", "Value"),
+        ("Field oxide (nm)", f"{field:.1f}"),
+        ("Gate oxide (nm)", f"{gate:.1f}"),
+        ("Intermediate oxide (nm)", f"{inter:.1f}"),
+    ])
 
 # Dopants (dummy values)
-x_um = np.linspace(0, 2.0, 2001)
-NA_bg = 1e15*np.ones_like(x_um)  # wafer p background
+dx_um = 2.0/2000
+x_um = np.arange(2001, dtype=np.float64)*dx_um  # 0–2 μm
+x_cm = x_um * 1e-4  # diffusion models work in cm
+NA_bg = 1e15  # wafer p background (scalar; broadcasts)
 
 # Phosphorus diffusion (constant source at 1000C for 20 min)
 D_P = D_cm2_s(D0=10.5, Ea_eV=3.69, T_C=1000)
-P = const_source_erfc(Cs=1e21, D=D_P, t_s=20*60, x_um=x_um)
+P = const_source_erfc(Cs=1e21, D=D_P, t_s=20*60, x_cm=x_cm)
 
 # Boron implant + anneal, then add background
-B_impl = implant_gaussian(dose_cm2=5e13, Rp_um=0.05, dR_um=0.02, x_um=x_um)
+# Gaussian implant (dR) broadened by a Gaussian anneal (sqrt(2Dt)) is itself a
+# Gaussian: dR_eff^2 = dR^2 + 2Dt (cm^2 → μm^2 via 1e8).
 D_B   = D_cm2_s(D0=0.76, Ea_eV=3.46, T_C=1000)
-B_imp_anneal = anneal_broaden(B_impl, D_B, 30*60, x_um)
-B = np.minimum(1e21, NA_bg + B_imp_anneal)
+B_imp_anneal = implant_gaussian(dose_cm2=5e13, Rp_um=0.05,
+                                dR_um=math.sqrt(0.02**2 + (2*D_B*30*60)*1e8), x_cm=x_cm)
+B = B_imp_anneal + NA_bg
+np.minimum(B, 1e21, out=B)  # clamp in place
 
 # Junction depth vs background
 xj = junction_depth(x_um, NA_bg, P)
@@ -73,16 +80,25 @@ rho_Al = 2.65e-8  # Ω·m
 t_Al   = 100e-9   # 100 nm
 Rs_Al  = rho_Al/t_Al
 
+# Peaks: one argmax pass per profile gives both the depth and the value
+iB = int(np.argmax(B)); vB = B[iB]
+iP = int(np.argmax(P)); vP = P[iP]
+
 with open("data/doping_table.csv","w",newline="", encoding="utf-8-sig") as f:
-    w=csv.writer(f); w.writerow(["Parameter","Value"])
-    w.writerow(["Boron peak concentration (atoms/cm³)", f"{B.max():.3e}"])
-    w.writerow(["Depth of boron peak (μm)", f"{x_um[np.argmax(B)]:.4f}"])
-    w.writerow(["Phosphorus peak concentration (atoms/cm³)", f"{P.max():.3e}"])
-    w.writerow(["Depth of phosphorus peak (μm)", f"{x_um[np.argmax(P)]:.4f}"])
-    w.writerow(["Junction depth (μm)", f"{xj:.4f}"])
+    csv.writer(f).writerows([
+        ("Parameter", "Value"),
+        ("Boron peak concentration (atoms/cm³)", f"{vB:.3e}"),
+        ("Depth of boron peak (μm)", f"{x_um[iB]:.4f}"),
+        ("Phosphorus peak concentration (atoms/cm³)", f"{vP:.3e}"),
+        ("Depth of phosphorus peak (μm)", f"{x_um[iP]:.4f}"),
+        ("Junction depth (μm)", f"{xj:.4f}"),
+    ])
     # crude Rs estimates if you want: use mobility model of your choice later
 
 with open("data/al_sheet_resistance.txt","w", encoding="utf-8-sig") as f:
     f.write(f"Aluminum sheet resistance (Ω/□): {Rs_Al:.3f}\n")
 
+# Make sure the background figure writes have landed
+wait_for_saves()
+
 print("Done → figures/ and data/")
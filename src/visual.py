@@ -1,12 +1,51 @@
+import io
+from concurrent.futures import ThreadPoolExecutor, wait
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless: figures only go to files, skip GUI toolkit init
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PatchCollection
 from matplotlib.animation import FuncAnimation
 
+# Figures are rendered to PNG bytes in memory; the disk writes run on a
+# background pool so the caller can keep computing. Call wait_for_saves()
+# before exiting to flush them (and surface any write errors).
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
+_pending_saves = set()  # successful writes drop out on completion; failures stay
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _forget_if_ok(fut):
+    if fut.exception() is None:
+        _pending_saves.discard(fut)
+
+def _savefig_async(out_png, **savefig_kwargs):
+    buf = io.BytesIO()
+    plt.savefig(buf, format="png", **savefig_kwargs)
+    fut = _IO_POOL.submit(_write_bytes, out_png, buf.getvalue())
+    _pending_saves.add(fut)
+    fut.add_done_callback(_forget_if_ok)
+
+def wait_for_saves():
+    """Block until every queued figure write is on disk; re-raises write errors."""
+    futs = list(_pending_saves)
+    wait(futs)
+    _pending_saves.difference_update(futs)
+    for fut in futs:
+        fut.result()
+
 # -------------------------------
 # 1) Dopant profile plot (semilog)
 # -------------------------------
 def plot_dopant_profiles(x_um, B, P, out_png, title="Dopant Profiles"):
+    """
+    Semilog plot of boron and phosphorus profiles vs depth.
+    Returns out_png; the file is written in the background and only
+    guaranteed to exist after wait_for_saves().
+    """
     plt.figure(figsize=(6, 4))
     plt.semilogy(x_um, B, label="Boron")
     plt.semilogy(x_um, P, label="Phosphorus")
@@ -16,7 +55,7 @@ def plot_dopant_profiles(x_um, B, P, out_png, title="Dopant Profiles"):
     plt.grid(True, which="both", linewidth=0.4, alpha=0.4)
     plt.legend(loc="best", frameon=False)
     plt.tight_layout()
-    plt.savefig(out_png, dpi=200)
+    _savefig_async(out_png, dpi=200)
     plt.close()
     return out_png
 
@@ -34,6 +73,8 @@ def draw_wafer_cross_section(
     oxide_nm_list: list of oxide thicknesses in nm (bottom -> top).
     oxide_labels : list of strings matching oxide_nm_list (optional).
     xj_um       : if set, hatches an n+ region to that depth (visual only).
+    Returns out_png; the file is written in the background and only
+    guaranteed to exist after wait_for_saves().
     """
     if oxide_labels is None:
         oxide_labels = [f"Oxide {i+1}" for i in range(len(oxide_nm_list))]
@@ -62,28 +103,26 @@ def draw_wafer_cross_section(
                 ha="left", va="bottom", fontsize=9)
 
     # Oxides on top (scaled visually; not to scale)
-    y = si_h
     # scale: map 0–max_nm to 0–0.35H gently
     safe_thks = [t if (t is not None and t >= 0) else 0.0 for t in oxide_nm_list]
-    max_nm = max(1.0, max(safe_thks))
+    t_arr = np.asarray(safe_thks, dtype=float)
+    max_nm = max(1.0, float(t_arr.max()))
     scale = 0.35 * H / (np.sqrt(max_nm) + 1e-9)  # sqrt scaling keeps very thick oxides reasonable
 
-    for t_nm, label in zip(safe_thks, oxide_labels):
-        # visual height via sqrt scale; clamp a minimum so lines are visible
-        t_vis = max(0.012 * H, np.sqrt(t_nm) * scale)
-        ax.add_patch(
-            Rectangle(
-                (0, y),
-                W,
-                t_vis,
-                facecolor="#d9ecff",
-                edgecolor="black",
-                linewidth=1.0,
-            )
+    # visual heights via sqrt scale; clamp a minimum so lines are visible
+    t_vis = np.maximum(0.012 * H, np.sqrt(t_arr) * scale)
+    ys = si_h + np.concatenate(([0.0], np.cumsum(t_vis[:-1])))
+    ax.add_collection(
+        PatchCollection(
+            [Rectangle((0, y), W, h) for y, h in zip(ys, t_vis)],
+            facecolor="#d9ecff",
+            edgecolor="black",
+            linewidth=1.0,
         )
-        # annotate thickness
-        ax.text(0.04 * W, y + t_vis / 2, f"{label}: {t_nm:.0f} nm", ha="left", va="center", fontsize=9)
-        y += t_vis
+    )
+    # annotate thickness
+    for y, h, t_nm, label in zip(ys, t_vis, t_arr, oxide_labels):
+        ax.text(0.04 * W, y + h / 2, f"{label}: {t_nm:.0f} nm", ha="left", va="center", fontsize=9)
 
     # cosmetics
     ax.set_xlim(0, W)
@@ -91,7 +130,7 @@ def draw_wafer_cross_section(
     ax.axis("off")
     ax.set_title("Wafer Cross-Section (not to scale)", fontsize=11)
     plt.tight_layout()
-    plt.savefig(out_png, dpi=200, bbox_inches="tight")
+    _savefig_async(out_png, dpi=200, bbox_inches="tight")
     plt.close()
     return out_png
 
@@ -102,6 +141,7 @@ def animate_oxidation(times_min, thickness_nm, out_mp4="figures/oxidation.mp4",
     """
     times_min: 1D array of times [min]
     thickness_nm: 1D array same length; oxide thickness vs time
+                  (e.g. deal_grove.deal_grove_thickness_vec(B, B/A, times_min))
     Renders a simple growing oxide slab on silicon.
     """
     times_min = np.asarray(times_min)
@@ -122,9 +162,11 @@ def animate_oxidation(times_min, thickness_nm, out_mp4="figures/oxidation.mp4",
 
     t_text = ax.text(W - 0.05, 0.03, "", ha="right", va="bottom", fontsize=10)
 
-    # pre-compute visual scale
+    # pre-compute visual scale, per-frame heights and labels
     max_nm = max(1.0, float(thickness_nm.max()))
     scale = 0.35 * H / (np.sqrt(max_nm) + 1e-9)
+    h_vis = np.maximum(0.012 * H, np.sqrt(np.maximum(thickness_nm, 0.0)) * scale)
+    labels = [f"t = {t:.1f} min, x ≈ {x:.0f} nm" for t, x in zip(times_min, thickness_nm)]
 
     ax.set_xlim(0, W)
     ax.set_ylim(0, H)
@@ -132,10 +174,8 @@ def animate_oxidation(times_min, thickness_nm, out_mp4="figures/oxidation.mp4",
     ax.set_title("Field Oxidation (not to scale)")
 
     def update(i):
-        t_nm = thickness_nm[i]
-        h_vis = max(0.012 * H, np.sqrt(max(t_nm, 0.0)) * scale)
-        ox_rect.set_height(h_vis)
-        t_text.set_text(f"t = {times_min[i]:.1f} min, x ≈ {t_nm:.0f} nm")
+        ox_rect.set_height(h_vis[i])
+        t_text.set_text(labels[i])
         return (ox_rect, t_text)
 
     frames = len(times_min)
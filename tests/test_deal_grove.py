@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import deal_grove  # noqa: E402
+
+
+def test_thickness_matches_closed_form():
+    # wet field oxide from main.py
+    assert deal_grove.deal_grove_thickness(4600, 20.354, 100) == pytest.approx(574.582, abs=1e-3)
+    assert deal_grove.deal_grove_thickness(4600, 20.354, 0) == 0.0
+
+
+def test_negative_discriminant_raises():
+    with pytest.raises(ValueError):
+        deal_grove.deal_grove_thickness(B_nm2_per_min=4600, B_over_A_nm_per_min=20.354, t_min=-100)
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_vec_matches_scalar_for_any_shape(monkeypatch, use_numba):
+    if use_numba and not deal_grove.HAVE_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(deal_grove, "HAVE_NUMBA", use_numba)
+    B, BoA = 4600, 20.354
+    for t in (5.0, [0, 10, 100], np.arange(12).reshape(3, 4), np.linspace(0, 100, 7, dtype=np.float32)):
+        t = np.asarray(t)
+        ref = np.array([deal_grove.deal_grove_thickness(B, BoA, float(v)) for v in t.ravel()]).reshape(t.shape)
+        out = deal_grove.deal_grove_thickness_vec(B, BoA, t)
+        assert np.shape(out) == t.shape
+        assert np.allclose(out, ref, rtol=1e-12)
+    with pytest.raises(ValueError):
+        deal_grove.deal_grove_thickness_vec(B, BoA, [10.0, -100.0])
+
+
+def test_factory_matches_scalar():
+    f = deal_grove.deal_grove_factory(450, 5)
+    assert f(50.0) == pytest.approx(deal_grove.deal_grove_thickness(450, 5, 50))
@@ -0,0 +1,80 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import diffusion  # noqa: E402
+
+
+def _surface_implant():
+    x_cm = np.arange(2001, dtype=np.float64) * (2.0/2000) * 1e-4
+    return x_cm, diffusion.implant_gaussian(5e13, 0.05, 0.02, x_cm)
+
+
+def _broaden_both_ways(monkeypatch, Cx, D, t_s, x_cm):
+    monkeypatch.setattr(diffusion, "FFT_SIGMA_PX", math.inf)
+    fir = diffusion.anneal_broaden(Cx, D, t_s, x_cm)
+    monkeypatch.setattr(diffusion, "FFT_SIGMA_PX", 0.0)
+    fft = diffusion.anneal_broaden(Cx, D, t_s, x_cm)
+    return fir, fft
+
+
+def test_anneal_paths_agree_near_surface(monkeypatch):
+    x_cm, C = _surface_implant()
+    dx = x_cm[1] - x_cm[0]
+    for sigma_px in (diffusion.FFT_SIGMA_PX, 49.99, 50.01):
+        D = (sigma_px*dx)**2 / (2*1800)
+        fir, fft = _broaden_both_ways(monkeypatch, C, D, 1800, x_cm)
+        scale = fir.max()
+        assert np.max(np.abs(fir - fft)) < 1e-6*scale
+        assert abs(fir[0] - fft[0]) < 1e-6*scale
+        # nothing from the surface wraps around to the 2 μm end
+        assert fft[-1] < 1e-6*scale
+
+
+def test_anneal_continuous_across_threshold():
+    x_cm, C = _surface_implant()
+    dx = x_cm[1] - x_cm[0]
+    lo, hi = (diffusion.anneal_broaden(C, (s*dx)**2/(2*1800), 1800, x_cm)
+              for s in (diffusion.FFT_SIGMA_PX - 0.01, diffusion.FFT_SIGMA_PX + 0.01))
+    assert np.max(np.abs(lo - hi)) < 1e-3*lo.max()
+
+
+def test_profiles_accept_non_float64_grids():
+    D = diffusion.D_cm2_s(D0=10.5, Ea_eV=3.69, T_C=1000)
+    x64 = np.linspace(0, 2e-4, 12)
+    for x in (x64.astype(np.float32), np.arange(3), x64.reshape(3, 4), 1e-5):
+        for f, args in ((diffusion.const_source_erfc, (1e21, D, 1200)),
+                        (diffusion.limited_source_gaussian, (1e13, D, 1200)),
+                        (diffusion.implant_gaussian, (5e13, 0.05, 0.02))):
+            out = f(*args, x)
+            assert np.shape(out) == np.shape(x)
+            ref = f(*args, np.asarray(x, dtype=np.float64).ravel())
+            assert np.allclose(np.ravel(out), ref, rtol=1e-4)  # float32 in, float32 math on the NumPy path
+
+
+def test_erfc_propagates_nan_and_rejects_zero_dt():
+    D = diffusion.D_cm2_s(D0=10.5, Ea_eV=3.69, T_C=1000)
+    x = np.array([0.0, np.nan, 1e-5])
+    out = diffusion.const_source_erfc(1e21, D, 1200, x)
+    assert np.isnan(out[1]) and np.isfinite(out[[0, 2]]).all()
+    with pytest.raises(ValueError):
+        diffusion.const_source_erfc(1e21, D, 0, x)
+
+
+def test_erf_matches_scipy_on_every_interval():
+    from scipy.special import erf as scipy_erf
+    from erf import erf_array, erf_scalar
+
+    # |x| < 0.84375, [0.84375, 1.25), [1.25, 1/0.35), [1/0.35, 6), >= 6
+    edges = [0.0, 0.84375, 1.25, 1.0/0.35, 6.0, 9.0]
+    x = np.concatenate([np.linspace(lo, hi, 200, endpoint=False)
+                        for lo, hi in zip(edges[:-1], edges[1:])])
+    x = np.concatenate([x, -x, [np.inf, -np.inf, -0.0]])
+    ref = scipy_erf(x)
+    assert np.max(np.abs(erf_array(x) - ref)) < 1e-15
+    assert np.max(np.abs(np.array([erf_scalar(v) for v in x]) - ref)) < 1e-15
+    assert np.signbit(erf_array(-0.0)) and math.copysign(1.0, erf_scalar(-0.0)) < 0